@@ -1,6 +1,10 @@
 # met_annot_explorer/annotation_table.py
 
-from typing import Any, List, Optional
+import io
+import os
+import warnings
+import zlib
+from typing import Any, List, Literal, Optional
 
 import pandas as pd
 
@@ -13,6 +17,14 @@ from met_annot_explorer.exceptions import (
     NonSerialFeatureIDError,
 )
 
+# Size of the blocks checksummed to detect in-place rewrites of the source file.
+BLOCK_SIZE = 1 << 20
+
+
+def _block_checksums(raw: bytes) -> List[int]:
+    """Return the CRC32 checksum of each BLOCK_SIZE block of raw, the last one possibly partial."""
+    return [zlib.crc32(raw[start : start + BLOCK_SIZE]) for start in range(0, len(raw), BLOCK_SIZE)]
+
 
 class AnnotationTable:
     def __init__(self, file_path: str):
@@ -27,35 +39,184 @@ class AnnotationTable:
         """
         self.file_path = file_path
         self.data: Optional[pd.DataFrame] = None
+        self._file_size = 0
+        self._file_mtime_ns = 0
+        self._block_checksums: List[int] = []
         self._load_data()
         self._validate_unique_feature_id()
         self._validate_serially_incremented_feature_id()
 
-    def _load_data(self) -> None:
-        """Load the data from the file into a pandas DataFrame."""
+    def _read_file(self) -> bytes:
+        """Read the raw file content and record its size, mtime and block checksums."""
         try:
-            self.data = pd.read_csv(self.file_path, sep="\t")
+            with open(self.file_path, "rb") as handle:
+                stat = os.fstat(handle.fileno())
+                raw = handle.read()
         except Exception as e:
             raise DataLoadError(e) from e
+        self._file_size = len(raw)
+        self._file_mtime_ns = stat.st_mtime_ns
+        self._block_checksums = _block_checksums(raw)
+        return raw
 
-    def _validate_unique_feature_id(self) -> None:
-        """Validate that feature_id is unique."""
-        if "feature_id" not in self.data.columns:
+    def _load_data(self, raw: Optional[bytes] = None) -> None:
+        """Load the data from the file (or from its already read content) into a pandas DataFrame."""
+        if raw is None:
+            raw = self._read_file()
+        try:
+            self.data = pd.read_csv(io.BytesIO(raw), sep="\t")
+        except Exception as e:
+            raise DataLoadError(e) from e
+
+    def _validate_unique_feature_id(self, rows: Optional[pd.DataFrame] = None, last_id: int = 0) -> None:
+        """
+        Validate that feature_id is unique.
+
+        Args:
+            rows (Optional[pd.DataFrame]): The rows to validate. Defaults to the whole table.
+            last_id (int): The last feature_id of the already validated rows preceding `rows`.
+        """
+        rows = self.data if rows is None else rows
+        if "feature_id" not in rows.columns:
             raise FeatureIDNotFoundError()
-        duplicated_ids = self.data[self.data["feature_id"].duplicated()]["feature_id"].tolist()
+        feature_ids = rows["feature_id"]
+        duplicated = feature_ids.duplicated()
+        if last_id > 0 and pd.api.types.is_numeric_dtype(feature_ids):
+            # The preceding rows are serial, so their ids are exactly 1..last_id.
+            duplicated |= feature_ids.between(1, last_id)
+        duplicated_ids = feature_ids[duplicated].tolist()
         if duplicated_ids:
             raise DuplicateFeatureIDError(duplicated_ids[0])
 
-    def _validate_serially_incremented_feature_id(self) -> None:
-        """Validate that feature_id is serially incremented starting from 1."""
-        if "feature_id" not in self.data.columns:
+    def _validate_serially_incremented_feature_id(self, rows: Optional[pd.DataFrame] = None, last_id: int = 0) -> None:
+        """
+        Validate that feature_id is serially incremented starting from 1.
+
+        Args:
+            rows (Optional[pd.DataFrame]): The rows to validate. Defaults to the whole table.
+            last_id (int): The last feature_id of the already validated rows preceding `rows`.
+        """
+        rows = self.data if rows is None else rows
+        if "feature_id" not in rows.columns:
             raise FeatureIDNotFoundError()
-        feature_ids = self.data["feature_id"]
-        expected_ids = list(range(1, len(feature_ids) + 1))
+        feature_ids = rows["feature_id"]
+        expected_ids = range(last_id + 1, last_id + len(feature_ids) + 1)
         for expected_id, actual_id in zip(expected_ids, feature_ids):
             if expected_id != actual_id:
                 raise NonSerialFeatureIDError(expected_id, actual_id)
 
+    def refresh(self) -> Literal["unchanged", "appended", "reloaded"]:
+        """
+        Bring the table up to date with its source file.
+
+        The file size, mtime and per-block checksums recorded at the last load are used to tell
+        an untouched file from an append-only one. Appended rows are parsed and validated on their
+        own and concatenated to the existing data. Any other change, or appended rows that would
+        change the type of a column, triggers a full reload.
+
+        Returns:
+            Literal["unchanged", "appended", "reloaded"]: How the table was updated.
+
+        Raises:
+            DataLoadError: If the data fails to load.
+            DuplicateFeatureIDError: If the refreshed table has duplicate feature_id values.
+            NonSerialFeatureIDError: If the refreshed table's feature_id values are not serial.
+        """
+        if self.data is None:
+            raise DataNotLoadedError()
+        try:
+            stat = os.stat(self.file_path)
+        except Exception as e:
+            raise DataLoadError(e) from e
+        if stat.st_size == self._file_size and stat.st_mtime_ns == self._file_mtime_ns:
+            return "unchanged"
+
+        previous_state = (self.data, self._file_size, self._file_mtime_ns, self._block_checksums)
+        _, previous_size, _, previous_checksums = previous_state
+        raw = self._read_file()
+        full_blocks = previous_size // BLOCK_SIZE
+        prefix_unchanged = self._file_size >= previous_size and (
+            self._block_checksums[:full_blocks] == previous_checksums[:full_blocks]
+            and (
+                previous_size % BLOCK_SIZE == 0
+                or zlib.crc32(raw[full_blocks * BLOCK_SIZE : previous_size]) == previous_checksums[full_blocks]
+            )
+        )
+        if prefix_unchanged and self._file_size == previous_size:
+            return "unchanged"
+
+        try:
+            # Rows can only be appended after a complete last line, otherwise that line was extended.
+            if prefix_unchanged and raw[previous_size - 1 : previous_size] == b"\n":
+                appended = raw[previous_size:]
+                # Blank lines are skipped by the parser, so they add no rows.
+                if not appended.strip(b" \r\n"):
+                    return "unchanged"
+                if self._append_rows(appended):
+                    return "appended"
+            self._load_data(raw)
+            self._validate_unique_feature_id()
+            self._validate_serially_incremented_feature_id()
+        except Exception:
+            self.data, self._file_size, self._file_mtime_ns, self._block_checksums = previous_state
+            raise
+        return "reloaded"
+
+    def _append_rows(self, raw: bytes) -> bool:
+        """
+        Parse, validate and append the rows contained in the appended part of the file.
+
+        Args:
+            raw (bytes): The appended part of the file, starting at the beginning of a line.
+
+        Returns:
+            bool: False if the table has no rows yet or the new rows would change the type of a column,
+                in which case only a full reload gives the same data and nothing is appended.
+        """
+        if len(self.data) == 0:
+            # A header-only table has no column types to keep, a full load infers them from the new rows.
+            return False
+        columns = self.data.columns
+        # Parse the text columns as text, as a full load would given the existing rows.
+        text_dtypes = {
+            column_name: dtype
+            for column_name, dtype in self.data.dtypes.items()
+            if not pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        }
+        try:
+            # Every line is parsed against the header's width, so short lines are padded with missing
+            # values as a full load does, and longer ones are reported instead of becoming the index.
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", pd.errors.ParserWarning)
+                new_rows = pd.read_csv(
+                    io.BytesIO(raw),
+                    sep="\t",
+                    header=None,
+                    names=range(len(columns)),
+                    index_col=False,
+                    dtype={columns.get_loc(column_name): dtype for column_name, dtype in text_dtypes.items()},
+                )
+        except pd.errors.ParserWarning as e:
+            raise DataLoadError(ValueError(f"Expected {len(columns)} fields in an appended line")) from e
+        except Exception as e:
+            raise DataLoadError(e) from e
+        new_rows.columns = columns
+        new_rows = new_rows.astype(text_dtypes)
+        for column_name in columns:
+            existing, new = self.data[column_name], new_rows[column_name]
+            if (
+                pd.api.types.is_numeric_dtype(existing)
+                and not pd.api.types.is_bool_dtype(existing)
+                and not pd.api.types.is_numeric_dtype(new)
+                and new.notna().any()
+            ):
+                return False
+        last_id = int(self.data["feature_id"].iloc[-1])
+        self._validate_serially_incremented_feature_id(new_rows, last_id)
+        self._validate_unique_feature_id(new_rows, last_id)
+        self.data = pd.concat([self.data, new_rows], ignore_index=True)
+        return True
+
     def get_column_names(self) -> List[str]:
         """
         Get the list of column names in the table.
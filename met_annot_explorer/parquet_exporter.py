@@ -0,0 +1,165 @@
+# met_annot_explorer/parquet_exporter.py
+
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from met_annot_explorer.annotation_table import AnnotationTable
+from met_annot_explorer.exceptions import DataNotLoadedError, MissingColumnError
+from met_annot_explorer.feature_table import FeatureTable
+
+INTENSITY_MEASURES = ("Peak area", "Peak height")
+
+
+class ParquetExporter:
+    def __init__(self, feature_table: FeatureTable, annotation_table: AnnotationTable):
+        """
+        Initialize the ParquetExporter class with a FeatureTable and an AnnotationTable.
+
+        The exported rows are the FeatureTable in long format, one row per feature and sample with
+        one column per intensity measure, joined to the AnnotationTable on feature_id and to the
+        FeatureTable's SampleMetadata on filename.
+
+        Args:
+            feature_table (FeatureTable): An instance of the FeatureTable class.
+            annotation_table (AnnotationTable): An instance of the AnnotationTable class.
+
+        Raises:
+            DataNotLoadedError: If one of the tables has no data.
+        """
+        self.feature_table = feature_table
+        self.annotation_table = annotation_table
+        self.sample_metadata = feature_table.sample_metadata
+        if self.feature_table.data is None or self.annotation_table.data is None or self.sample_metadata.data is None:
+            raise DataNotLoadedError()
+        self._sample_columns = self._get_sample_columns()
+        intensity_columns = {col for columns in self._sample_columns.values() for col in columns.values()}
+        self._feature_columns = [col for col in self.feature_table.data.columns if col not in intensity_columns]
+        self._annotations = self._rename_overlapping_columns(
+            self.annotation_table.data,
+            self._feature_columns + ["filename", *INTENSITY_MEASURES],
+            "feature_id",
+            "_annotation",
+        ).set_index("feature_id")
+        self._metadata = self._rename_overlapping_columns(
+            self.sample_metadata.data,
+            self._feature_columns + ["filename", *INTENSITY_MEASURES, *self._annotations.columns],
+            "filename",
+            "_metadata",
+        ).set_index("filename")
+        self.schema = self._build_schema()
+
+    def _get_sample_columns(self) -> Dict[str, Dict[str, str]]:
+        """Map each sample filename to its intensity columns in the FeatureTable, keyed by measure."""
+        sample_columns: Dict[str, Dict[str, str]] = {}
+        for col in self.feature_table.data.columns:
+            for measure in INTENSITY_MEASURES:
+                if f" {measure}" in col:
+                    filename = col.split(" Peak")[0]
+                    sample_columns.setdefault(filename, {})[measure] = col
+        return sample_columns
+
+    @staticmethod
+    def _rename_overlapping_columns(data: pd.DataFrame, taken: List[str], key: str, suffix: str) -> pd.DataFrame:
+        """Suffix the columns of data, other than the join key, whose names are already taken."""
+        return data.rename(columns={col: f"{col}{suffix}" for col in data.columns if col != key and col in taken})
+
+    def _build_schema(self) -> pa.Schema:
+        """
+        Build the Arrow schema of the exported rows from the full source tables.
+
+        Inferring the types once from the whole tables keeps them identical across chunks.
+        Columns without any value are typed as strings.
+        """
+        fields = [
+            *pa.Schema.from_pandas(self.feature_table.data[self._feature_columns], preserve_index=False),
+            pa.field("filename", pa.string()),
+            *(pa.field(measure, pa.float64()) for measure in INTENSITY_MEASURES),
+            *pa.Schema.from_pandas(self._annotations, preserve_index=False),
+            *pa.Schema.from_pandas(self._metadata, preserve_index=False),
+        ]
+        return pa.schema([
+            pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in fields
+        ])
+
+    def iter_tables(self, chunk_size: int = 10_000) -> Iterator[pa.Table]:
+        """
+        Yield the exported rows as Arrow tables, one per chunk of features and sample.
+
+        Args:
+            chunk_size (int): The number of features joined at a time.
+
+        Returns:
+            Iterator[pa.Table]: The exported rows, following `schema`.
+        """
+        data = self.feature_table.data
+        for start in range(0, len(data), chunk_size):
+            chunk = data.iloc[start : start + chunk_size].reset_index(drop=True)
+            features = pd.concat(
+                [
+                    chunk[self._feature_columns],
+                    self._annotations.reindex(chunk["feature_id"]).reset_index(drop=True),
+                ],
+                axis=1,
+            )
+            for filename, columns in self._sample_columns.items():
+                intensities = {
+                    measure: chunk[columns[measure]].to_numpy() if measure in columns else float("nan")
+                    for measure in INTENSITY_MEASURES
+                }
+                rows = features.assign(filename=filename, **intensities, **self._metadata.loc[filename].to_dict())
+                yield pa.Table.from_pandas(rows, schema=self.schema, preserve_index=False)
+
+    def export(
+        self,
+        output_dir: str,
+        partition_by: Optional[List[str]] = None,
+        chunk_size: int = 10_000,
+        row_group_size: int = 100_000,
+    ) -> None:
+        """
+        Stream the exported rows to a Parquet dataset.
+
+        The dataset is hive-partitioned on `partition_by` (e.g. `canopus_npc_pathway` or `source_taxon`),
+        string columns are dictionary-encoded and row-group statistics are written so that query engines
+        can prune partitions and row groups. Row groups are written as chunks are produced, which keeps
+        memory bounded by `chunk_size` and `row_group_size` per open partition.
+
+        Args:
+            output_dir (str): The directory to write the dataset to. It must not already contain data.
+            partition_by (Optional[List[str]]): The columns to partition the dataset on.
+            chunk_size (int): The number of features joined at a time.
+            row_group_size (int): The maximum number of rows per row group.
+
+        Raises:
+            MissingColumnError: If a partition column is not an exported column.
+        """
+        partition_by = partition_by or []
+        for column_name in partition_by:
+            if column_name not in self.schema.names:
+                raise MissingColumnError(column_name)
+        partitioning = (
+            ds.partitioning(pa.schema([self.schema.field(col) for col in partition_by]), flavor="hive")
+            if partition_by
+            else None
+        )
+        string_columns = [
+            field.name
+            for field in self.schema
+            if field.name not in partition_by and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type))
+        ]
+        file_options = ds.ParquetFileFormat().make_write_options(
+            use_dictionary=string_columns, write_statistics=True
+        )
+        batches = (batch for table in self.iter_tables(chunk_size) for batch in table.to_batches())
+        ds.write_dataset(
+            pa.RecordBatchReader.from_batches(self.schema, batches),
+            output_dir,
+            format="parquet",
+            partitioning=partitioning,
+            file_options=file_options,
+            min_rows_per_group=row_group_size,
+            max_rows_per_group=row_group_size,
+        )
@@ -1,8 +1,12 @@
+import os
+import shutil
+
 import pandas as pd
 import pytest
 
 from met_annot_explorer.annotation_table import AnnotationTable
 from met_annot_explorer.exceptions import (
+    DataLoadError,
     DuplicateFeatureIDError,
     NonSerialFeatureIDError,
 )
@@ -82,3 +86,145 @@ def test_non_serial_feature_id(annotation_table_with_non_serial_feature_id):
     with pytest.raises(NonSerialFeatureIDError) as excinfo:
         AnnotationTable(annotation_table_with_non_serial_feature_id)
     assert "Expected feature_id" in str(excinfo.value)
+
+
+@pytest.fixture
+def annotation_table_path(tmp_path):
+    """Fixture to create a path to a copy of the valid annotation table that can be modified."""
+    path = tmp_path / "annotation_table.tsv"
+    shutil.copyfile("tests/data/valid_annotation_table.tsv", path)
+    return path
+
+
+def _append_line(path, line):
+    """Append a line to a file and bump its mtime so the change is always detected."""
+    with open(path, "a") as handle:
+        handle.write(line)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_refresh_unchanged(annotation_table_path):
+    """Test that refresh leaves the data untouched when the file did not change."""
+    table = AnnotationTable(str(annotation_table_path))
+    data = table.data
+    assert table.refresh() == "unchanged"
+    os.utime(annotation_table_path, ns=(0, 0))
+    assert table.refresh() == "unchanged"
+    assert table.data is data
+
+
+def test_refresh_appended(annotation_table_path):
+    """Test that appended rows are parsed and validated incrementally."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    _append_line(annotation_table_path, f"{row_count + 1}\tNEWIK2D\n")
+    assert table.refresh() == "appended"
+    assert len(table.data) == row_count + 1
+    assert table.data["feature_id"].iloc[-1] == row_count + 1
+    assert table.data["sources_IK2D"].iloc[-1] == "NEWIK2D"
+    assert table.refresh() == "unchanged"
+
+
+def test_refresh_appended_non_serial_feature_id(annotation_table_path):
+    """Test that a failed incremental validation leaves the table in its previous state."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    _append_line(annotation_table_path, f"{row_count + 2}\tNEWIK2D\n")
+    with pytest.raises(NonSerialFeatureIDError):
+        table.refresh()
+    assert len(table.data) == row_count
+
+
+def test_refresh_appended_duplicate_feature_id(annotation_table_path):
+    """Test that appended rows reusing an existing feature_id are rejected, as for a full load."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    _append_line(annotation_table_path, "1\tNEWIK2D\n")
+    with pytest.raises(DuplicateFeatureIDError):
+        AnnotationTable(str(annotation_table_path))
+    # Appended rows are checked for serial ids first, which a reused id already breaks.
+    with pytest.raises(NonSerialFeatureIDError):
+        table.refresh()
+    assert len(table.data) == row_count
+
+
+def test_refresh_rewritten(annotation_table_path):
+    """Test that a rewritten file is fully reloaded."""
+    table = AnnotationTable(str(annotation_table_path))
+    data = table.data.head(3)
+    data.to_csv(annotation_table_path, sep="\t", index=False)
+    stat = os.stat(annotation_table_path)
+    os.utime(annotation_table_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert table.refresh() == "reloaded"
+    assert len(table.data) == 3
+
+
+def test_refresh_appended_matches_full_load(annotation_table_path):
+    """Test that appended rows get the same dtypes and values as a full load of the file."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    _append_line(annotation_table_path, f"{row_count + 1}\tNEWIK2D\t1\t123\n")
+    assert table.refresh() == "appended"
+    fresh_table = AnnotationTable(str(annotation_table_path))
+    pd.testing.assert_series_equal(table.data.dtypes, fresh_table.data.dtypes)
+    pd.testing.assert_frame_equal(table.data, fresh_table.data)
+    assert len(table.filter_by_value("sources_npc_pathway", "123")) == 1
+
+
+def test_refresh_appended_whitespace(annotation_table_path):
+    """Test that appending only blank lines is reported as unchanged."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    _append_line(annotation_table_path, "\n  \n")
+    assert table.refresh() == "unchanged"
+    assert len(table.data) == row_count
+
+
+def test_refresh_appended_too_many_fields(annotation_table_path):
+    """Test that DataLoadError is raised, as for a full load, when an appended line has too many fields."""
+    table = AnnotationTable(str(annotation_table_path))
+    row_count = len(table.data)
+    field_count = len(table.data.columns)
+    _append_line(annotation_table_path, "\t".join([str(row_count + 1)] * (field_count + 1)) + "\n")
+    with pytest.raises(DataLoadError):
+        AnnotationTable(str(annotation_table_path))
+    with pytest.raises(DataLoadError):
+        table.refresh()
+    assert len(table.data) == row_count
+
+
+def test_non_numeric_feature_id(annotation_table_path):
+    """Test that NonSerialFeatureIDError is raised for a non-numeric feature_id, on load and on refresh."""
+    table = AnnotationTable(str(annotation_table_path))
+    _append_line(annotation_table_path, "abc\tNEWIK2D\n")
+    with pytest.raises(NonSerialFeatureIDError):
+        AnnotationTable(str(annotation_table_path))
+    with pytest.raises(NonSerialFeatureIDError):
+        table.refresh()
+    with pytest.raises(NonSerialFeatureIDError):
+        table.refresh()
+
+
+def test_refresh_header_only(tmp_path):
+    """Test that rows appended to a header-only table are typed as in a full load."""
+    path = tmp_path / "annotation_table.tsv"
+    path.write_text("feature_id\tname\tscore\n")
+    table = AnnotationTable(str(path))
+    _append_line(path, "1\tfoo\t2.5\n")
+    assert table.refresh() == "reloaded"
+    pd.testing.assert_frame_equal(table.data, AnnotationTable(str(path)).data)
+    _append_line(path, "2\tbar\t3.5\n")
+    assert table.refresh() == "appended"
+    pd.testing.assert_frame_equal(table.data, AnnotationTable(str(path)).data)
+
+
+def test_refresh_appended_short_line_first(tmp_path):
+    """Test that a short appended line followed by a full-width one is padded as in a full load."""
+    path = tmp_path / "annotation_table.tsv"
+    path.write_text("feature_id\tname\tscore\n1\ta\t1.5\n")
+    table = AnnotationTable(str(path))
+    _append_line(path, "2\tb\n3\tc\t2.5\n")
+    assert table.refresh() == "appended"
+    pd.testing.assert_frame_equal(table.data, AnnotationTable(str(path)).data)
+    assert table.data["score"].isna().tolist() == [False, True, False]
@@ -0,0 +1,69 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from met_annot_explorer.annotation_table import AnnotationTable
+from met_annot_explorer.exceptions import (
+    MissingColumnError,
+)
+from met_annot_explorer.feature_table import FeatureTable
+from met_annot_explorer.parquet_exporter import ParquetExporter
+from met_annot_explorer.sample_metadata import SampleMetadata
+
+
+@pytest.fixture
+def parquet_exporter():
+    """Fixture to create a ParquetExporter instance with valid test data."""
+    sample_metadata = SampleMetadata("tests/data/valid_sample_metadata.tsv")
+    feature_table = FeatureTable("tests/data/valid_feature_table.csv", sample_metadata)
+    annotation_table = AnnotationTable("tests/data/valid_annotation_table.tsv")
+    return ParquetExporter(feature_table, annotation_table)
+
+
+def test_iter_tables(parquet_exporter):
+    """Test if the joined rows are yielded with a stable schema."""
+    tables = list(parquet_exporter.iter_tables(chunk_size=500))
+    assert all(table.schema.equals(parquet_exporter.schema) for table in tables)
+    feature_table = parquet_exporter.feature_table
+    sample_count = len([col for col in feature_table.get_column_names() if "Peak area" in col])
+    assert sum(table.num_rows for table in tables) == len(feature_table.data) * sample_count
+
+
+def test_iter_tables_joined_values(parquet_exporter):
+    """Test if a joined row holds the intensity, annotation and sample metadata of its feature and sample."""
+    table = pa.concat_tables(parquet_exporter.iter_tables(chunk_size=500))
+    rows = table.filter(
+        (pc.field("feature_id") == 1) & (pc.field("filename") == "20240321_CVOL_Noni_mapp_01_72_02.mzML")
+    ).to_pylist()
+    assert len(rows) == 1
+    assert rows[0]["Peak area"] == pytest.approx(5.609597692719364e8)
+    assert rows[0]["canopus_npc_pathway"] == "Amino acids and Peptides"
+    assert rows[0]["source_taxon"] == "Morinda citrifolia"
+    blank_rows = table.filter(
+        (pc.field("feature_id") == 1) & (pc.field("filename") == "20240321_CVOL_Noni_mapp_01_72_bk.mzML")
+    ).to_pylist()
+    assert blank_rows[0]["Peak area"] == 0
+    assert blank_rows[0]["source_taxon"] == "ND"
+
+
+def test_export_partitioned(parquet_exporter, tmp_path):
+    """Test if the dataset is written partitioned, dictionary-encoded and with statistics."""
+    output_dir = tmp_path / "export"
+    parquet_exporter.export(str(output_dir), partition_by=["source_taxon", "canopus_npc_pathway"], chunk_size=500)
+    dataset = ds.dataset(str(output_dir), format="parquet", partitioning="hive")
+    table = dataset.to_table(filter=ds.field("source_taxon") == "Morinda citrifolia")
+    assert table.num_rows > 0
+    assert set(table.column("source_taxon").to_pylist()) == {"Morinda citrifolia"}
+    metadata = pq.ParquetFile(dataset.files[0]).metadata
+    filename_column = metadata.row_group(0).column(metadata.schema.names.index("filename"))
+    assert filename_column.has_dictionary_page
+    assert filename_column.is_stats_set
+
+
+def test_export_missing_partition_column(parquet_exporter, tmp_path):
+    """Test if MissingColumnError is raised when partitioning on an unknown column."""
+    with pytest.raises(MissingColumnError) as excinfo:
+        parquet_exporter.export(str(tmp_path / "export"), partition_by=["unknown_column"])
+    assert "unknown_column" in str(excinfo.value)